@@ -5,15 +5,84 @@
 # llm.py: fetch chunk text to build context for responses.
 
 
+import threading
+import time
 from contextlib import contextmanager
+from typing import Optional
 import psycopg
 from .settings import settings
 
 
-DSN = f"host={settings.pg_host} port={settings.pg_port} dbname={settings.pg_db} user={settings.pg_user} password={settings.pg_password}"
+DSN = f"host={settings.pg_host} port={settings.pg_port} dbname={settings.pg_db} user={settings.pg_user} password={settings.pg_password} connect_timeout={settings.pg_connect_timeout}"
+
+# Per-process pool, opened by the API lifespan (main.py). CLI tools (ingest)
+# never open it and keep using one-off connections.
+_pool = None
+_pool_wanted = False  # set once open_pool() is called; a failed open is retried
+_pool_retry_at = 0.0
+_pool_lock = threading.Lock()
+POOL_RETRY_SECS = 30
+
+
+def open_pool(min_size: Optional[int] = None, max_size: Optional[int] = None, timeout: float = 10.0):
+    global _pool, _pool_wanted, _pool_retry_at
+    if _pool is not None:
+        return _pool
+    _pool_wanted = True
+    from psycopg_pool import ConnectionPool
+    pool = ConnectionPool(
+        DSN,
+        min_size=min_size or settings.db_pool_min_size,
+        max_size=max_size or settings.db_pool_max_size,
+        # validate connections on checkout, so a Postgres restart doesn't hand out dead ones
+        check=ConnectionPool.check_connection,
+        # checkout wait: with Postgres down, get_conn() and /health fail after this
+        # instead of psycopg_pool's 30 s default
+        timeout=settings.db_pool_timeout,
+        open=True,
+    )
+    # block until min_size connections are established (fail fast on boot)
+    try:
+        pool.wait(timeout=timeout)
+    except Exception:
+        pool.close()
+        _pool_retry_at = time.monotonic() + POOL_RETRY_SECS
+        raise
+    _pool = pool
+    return _pool
+
+
+def _retry_open_pool():
+    # DB was down when the worker booted: try again at most every POOL_RETRY_SECS,
+    # one thread at a time; meanwhile callers use one-off connections
+    if not _pool_wanted or time.monotonic() < _pool_retry_at:
+        return
+    if not _pool_lock.acquire(blocking=False):
+        return
+    try:
+        if _pool is None:
+            open_pool(timeout=settings.pg_connect_timeout)
+    except Exception as e:
+        print(f"Warning: DB pool still unavailable: {e}")
+    finally:
+        _pool_lock.release()
+
+
+def close_pool():
+    global _pool, _pool_wanted
+    _pool_wanted = False
+    if _pool is not None:
+        _pool.close()
+        _pool = None
 
 
 @contextmanager
 def get_conn():
-    with psycopg.connect(DSN) as conn:
-        yield conn
\ No newline at end of file
+    if _pool is None:
+        _retry_open_pool()
+    if _pool is not None:
+        with _pool.connection() as conn:
+            yield conn
+    else:
+        with psycopg.connect(DSN) as conn:
+            yield conn
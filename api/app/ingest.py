@@ -1,11 +1,12 @@
 import argparse
 import os
 import pathlib
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 from .pdf_processor import extract_text_from_pdf
 from .chunker import chunk_text
 from .llm import embed_texts
 from .db import get_conn
+from .stage_profiler import StageProfiler
 TEXT_EXT = {".txt", ".md"}
 
 # Read text from a file (PDF or text)
@@ -57,33 +58,43 @@ def _insert_chunks(conn, doc_id: int, chunks: List[str], vectors: List[List[floa
         )
 
 
-def ingest_dir(root: str, chunk_size: int, overlap: int):
+def ingest_dir(root: str, chunk_size: int, overlap: int, profile_dir: Optional[str] = None):
+    # profile_dir set -> per-stage CPU/memory profiles (read, chunk, embed, insert)
+    profiler = StageProfiler(profile_dir)
     root_path = pathlib.Path(root)
     # Loop all project structure file
     paths = [p for p in root_path.rglob(
         "*") if p.suffix.lower() in {".pdf", ".txt", ".md"}]
     print(f"Found {len(paths)} files under {root}")
-    with get_conn() as conn:
-        with conn.transaction():
-            for path in paths:
-                text = _read_file(path)
-                if not text.strip():
-                    print(f"Skip empty: {path}")
-                    continue
-                doc_id = _upsert_document(conn, str(path), path.stem)
+    try:
+        with get_conn() as conn:
+            with conn.transaction():
+                for path in paths:
+                    with profiler.stage("read"):
+                        text = _read_file(path)
+                    if not text.strip():
+                        print(f"Skip empty: {path}")
+                        continue
+                    doc_id = _upsert_document(conn, str(path), path.stem)
 # chunks = [ "Chapter 1: Introduction\n\nThis chapter explains the design goals... (continues up to ~1000 chars)", "...(overlap 200 chars continues) Chapter 2: Architecture\n\nComponents include db, llm, chunker... (next ~1000 chars)",...
 # ]
-                chunks = chunk_text(
-                    text, max_chars=chunk_size, overlap=overlap)
-                if not chunks:
-                    continue
-                # embed in batches to minimize API calls
-                batch = 64
-                for s in range(0, len(chunks), batch):
-                    sub = chunks[s:s+batch]
-                    vecs = embed_texts(sub)
-                    _insert_chunks(conn, doc_id, sub, vecs)
-        print("Ingestion complete.")
+                    with profiler.stage("chunk"):
+                        chunks = chunk_text(
+                            text, max_chars=chunk_size, overlap=overlap)
+                    if not chunks:
+                        continue
+                    # embed in batches to minimize API calls
+                    batch = 64
+                    for s in range(0, len(chunks), batch):
+                        sub = chunks[s:s+batch]
+                        with profiler.stage("embed"):
+                            vecs = embed_texts(sub)
+                        with profiler.stage("insert"):
+                            _insert_chunks(conn, doc_id, sub, vecs)
+            print("Ingestion complete.")
+    finally:
+        # also on failure: the profile of a crashed/interrupted ingest is the interesting one
+        profiler.dump()
 
 
 if __name__ == "__main__":
@@ -93,9 +104,11 @@ if __name__ == "__main__":
                         default=int(os.getenv("CHUNK_SIZE", "1000")))
     parser.add_argument("--overlap", type=int,
                         default=int(os.getenv("CHUNK_OVERLAP", "200")))
+    parser.add_argument("--profile", nargs="?", const="profiles", default=None, metavar="DIR",
+                        help="Dump per-stage CPU/memory profiles to DIR (default: ./profiles)")
     args = parser.parse_args()
 
     import os
     chunk = args.chunk
     overlap = args.overlap
-    ingest_dir(args.root, chunk, overlap)
+    ingest_dir(args.root, chunk, overlap, profile_dir=args.profile)
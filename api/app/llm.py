@@ -1,21 +1,33 @@
 import os
 import json
-import requests
+import threading
 from typing import List, Dict
-from openai import OpenAI
-import cohere
-from google import genai
 from .settings import settings
 
+# Provider SDKs are heavy to import; clients are built on first use (or by warm_up()
+# from the server lifespan), so CLI tools and non-LLM processes never load them.
+_UNSET = object()
+_clients_lock = threading.Lock()
+
 
 # ==== OpenAI (Embeddings) ====
-_openai = None
-if settings.openai_api_key:
-    try:
-        _openai = OpenAI(api_key=settings.openai_api_key)
-    except Exception as e:
-        print(f"Warning: Could not initialize OpenAI client: {e}")
-        _openai = None
+_openai = _UNSET
+
+
+def _get_openai():
+    global _openai
+    if _openai is _UNSET:
+        with _clients_lock:
+            if _openai is _UNSET:
+                client = None
+                if settings.openai_api_key:
+                    try:
+                        from openai import OpenAI
+                        client = OpenAI(api_key=settings.openai_api_key, base_url=settings.openai_base_url)
+                    except Exception as e:
+                        print(f"Warning: Could not initialize OpenAI client: {e}")
+                _openai = client
+    return _openai
 
 # vectors = [
 #   [0.123456789, -0.000001234, 0.9999999],
@@ -25,10 +37,12 @@ def embed_texts(texts: List[str]) -> List[List[float]]:
     if not settings.openai_api_key:
         raise RuntimeError("OPENAI_API_KEY not set")
 
+    client = _get_openai()
     # If OpenAI client failed, use direct API calls
-    if not _openai:
+    if not client:
+        import requests
         print("Using direct API calls for embeddings...")
-        url = "https://api.openai.com/v1/embeddings"
+        url = settings.openai_base_url.rstrip("/") + "/embeddings"
         headers = {
             "Authorization": f"Bearer {settings.openai_api_key}",
             "Content-Type": "application/json"
@@ -44,19 +58,29 @@ def embed_texts(texts: List[str]) -> List[List[float]]:
         return [d["embedding"] for d in result["data"]]
 
     # Use OpenAI client if available
-    resp = _openai.embeddings.create(
+    resp = client.embeddings.create(
         model=settings.openai_embed_model, input=texts)
     return [d.embedding for d in resp.data]
 
 
 # ==== Cohere (Rerank) ====
-_co = None
-if settings.cohere_api_key:
-    try:
-        _co = cohere.Client(api_key=settings.cohere_api_key)
-    except Exception as e:
-        print(f"Warning: Could not initialize Cohere client: {e}")
-        _co = None
+_co = _UNSET
+
+
+def _get_cohere():
+    global _co
+    if _co is _UNSET:
+        with _clients_lock:
+            if _co is _UNSET:
+                client = None
+                if settings.cohere_api_key:
+                    try:
+                        import cohere
+                        client = cohere.Client(api_key=settings.cohere_api_key, base_url=settings.cohere_base_url)
+                    except Exception as e:
+                        print(f"Warning: Could not initialize Cohere client: {e}")
+                _co = client
+    return _co
 
 
 def rerank(query: str, docs: List[Dict], top_n: int = 8) -> List[Dict]:
@@ -64,11 +88,12 @@ def rerank(query: str, docs: List[Dict], top_n: int = 8) -> List[Dict]:
     docs: List of {"text": str, "meta": {...}}
     Returns: same docs subset with added 'score', sorted by score desc
     """
-    if not _co:
+    co = _get_cohere()
+    if not co:
         # no cohere key -> simple fallback: return first top_n
         return docs[:top_n]
     # Cohere accepts list of strings or dicts with 'text'
-    results = _co.rerank(
+    results = co.rerank(
         model=settings.cohere_rerank_model,
         query=query,
         documents=[{"text": d["text"]} for d in docs],
@@ -90,17 +115,29 @@ def rerank(query: str, docs: List[Dict], top_n: int = 8) -> List[Dict]:
 
 
 # ==== Gemini (Generation) ====
-_genai = None
-if settings.google_api_key:
-    try:
-        _genai = genai.Client(api_key=settings.google_api_key)
-    except Exception as e:
-        print(f"Warning: Could not initialize Google GenAI client: {e}")
-        _genai = None
+_genai = _UNSET
+
+
+def _get_genai():
+    global _genai
+    if _genai is _UNSET:
+        with _clients_lock:
+            if _genai is _UNSET:
+                client = None
+                if settings.google_api_key:
+                    try:
+                        from google import genai
+                        http_options = {"base_url": settings.gemini_base_url} if settings.gemini_base_url else None
+                        client = genai.Client(api_key=settings.google_api_key, http_options=http_options)
+                    except Exception as e:
+                        print(f"Warning: Could not initialize Google GenAI client: {e}")
+                _genai = client
+    return _genai
 
 
 def generate_answer(query: str, context_blocks: List[Dict], language: str = "vi") -> str:
-    if not _genai:
+    client = _get_genai()
+    if not client:
         raise RuntimeError("GOOGLE_API_KEY (or GEMINI_API_KEY) not set")
 
     # Build a compact prompt with guardrails
@@ -118,10 +155,33 @@ def generate_answer(query: str, context_blocks: List[Dict], language: str = "vi"
         lines.append(f"- {tag} {ttl} → {b['text']}")
     lines.append("\n---\nCÂU HỎI: " + query)
 
-    resp = _genai.models.generate_content(
+    resp = client.models.generate_content(
         model=settings.gemini_model,
         contents="\n".join(lines),
         config={"temperature": 0.2}
     )
     # New SDK returns object with .text
     return getattr(resp, "text", str(resp))
+
+
+def preload_sdks():
+    """
+    Import the provider SDK modules without building clients. Called in the gunicorn
+    master (gunicorn.conf.py) so forked workers share them copy-on-write; clients
+    (sockets, threads) are still built per worker by warm_up().
+    """
+    if settings.openai_api_key:
+        import openai  # noqa: F401
+    if settings.cohere_api_key:
+        import cohere  # noqa: F401
+    if settings.google_api_key:
+        from google import genai  # noqa: F401
+
+
+def warm_up() -> Dict[str, bool]:
+    """Build all provider clients up front (called once per server worker)"""
+    return {
+        "openai": _get_openai() is not None,
+        "cohere": _get_cohere() is not None,
+        "genai": _get_genai() is not None,
+    }
@@ -1,14 +1,49 @@
+import logging
+import time
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from pydantic import BaseModel
 from typing import List, Dict
 import orjson
 from .settings import settings
 from .retrieval import hybrid_search
-from .llm import rerank, generate_answer
-from .db import get_conn
-from .pdf_processor import pdf_processor
+from .llm import rerank, generate_answer, warm_up
+from .db import get_conn, open_pool, close_pool
 
-app = FastAPI(title="RAG Skeleton")
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Runs once per worker process (after gunicorn forks), so pools/clients are never shared
+    started = time.perf_counter()
+    try:
+        open_pool()
+    except Exception as e:
+        # keep serving (e.g. /health reports the DB error); get_conn uses direct connects
+        # and retries opening the pool on later requests (at most every POOL_RETRY_SECS)
+        logger.warning(f"DB pool not opened: {e}")
+    if settings.warm_up:
+        clients = warm_up()
+        try:
+            with get_conn() as conn:
+                conn.execute("SELECT 1")
+        except Exception as e:
+            logger.warning(f"DB warm-up failed: {e}")
+        logger.info(f"Warm-up done: {clients}")
+    app.state.startup_seconds = time.perf_counter() - started
+    yield
+    close_pool()
+
+
+app = FastAPI(title="RAG Skeleton", lifespan=lifespan)
+
+if settings.profiling_enabled:
+    # opt-in: wrap routes declared below, add the X-Profile middleware and /admin/profile
+    from .profiling import ProfilingRoute, profile_request_middleware, admin_router
+    app.router.route_class = ProfilingRoute
+    app.middleware("http")(profile_request_middleware)
+    app.include_router(admin_router)
 
 
 class AskRequest(BaseModel):
@@ -28,13 +63,15 @@ class AskResponse(BaseModel):
 
 @app.get("/health")
 def health():
-    # quick DB ping
+    # quick DB ping; startup_seconds = this worker's lifespan warm-up time
+    startup = getattr(app.state, "startup_seconds", None)
+    startup = round(startup, 3) if startup is not None else None
     try:
         with get_conn() as conn:
             conn.execute("SELECT 1")
     except Exception as e:
-        return {"ok": False, "error": str(e)}
-    return {"ok": True}
+        return {"ok": False, "error": str(e), "startup_seconds": startup}
+    return {"ok": True, "startup_seconds": startup}
 
 # Ask a question
 
@@ -89,6 +126,8 @@ def ask(req: AskRequest):
 @app.get("/capabilities")
 def get_capabilities():
     """Check PDF processing capabilities"""
+    # imported here: PDF/OCR tooling is only needed by ingestion, not by the query path
+    from .pdf_processor import pdf_processor
     return {
         "pdf_processing": pdf_processor.get_capabilities(),
         "database": "connected",
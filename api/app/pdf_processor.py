@@ -6,22 +6,17 @@ Supports multiple OCR approaches with intelligent fallback
 import tempfile
 import pathlib
 import logging
-from typing import Optional, List
+from importlib.util import find_spec
+from typing import Optional, List, TYPE_CHECKING
 import io
 
-try:
-    from pdf2image import convert_from_path
+if TYPE_CHECKING:
     from PIL import Image
-    import pytesseract
-    OCR_AVAILABLE = True
-except ImportError:
-    OCR_AVAILABLE = False
 
-try:
-    from pdfminer.high_level import extract_text as pdfminer_extract
-    PDFMINER_AVAILABLE = True
-except ImportError:
-    PDFMINER_AVAILABLE = False
+# Availability is probed without importing: pdf2image/pytesseract/PIL/pdfminer are only
+# loaded when a PDF actually needs them, so the API server (/capabilities) stays light.
+OCR_AVAILABLE = all(find_spec(m) is not None for m in ("pdf2image", "PIL", "pytesseract"))
+PDFMINER_AVAILABLE = find_spec("pdfminer") is not None
 
 logger = logging.getLogger(__name__)
 
@@ -83,6 +78,7 @@ class PDFProcessor:
     def _try_pdfminer(self, pdf_path: pathlib.Path) -> str:
         """Extract text using pdfminer.six"""
         try:
+            from pdfminer.high_level import extract_text as pdfminer_extract
             text = pdfminer_extract(str(pdf_path)) or ""
             return text.strip()
         except Exception as e:
@@ -93,6 +89,8 @@ class PDFProcessor:
         """Extract text using OCR (for scanned PDFs)"""
         try:
             logger.info(f"🔍 Starting OCR for {pdf_path.name}...")
+            from pdf2image import convert_from_path
+            import pytesseract
 
             # Convert PDF to images
             images = convert_from_path(
@@ -141,7 +139,7 @@ class PDFProcessor:
             logger.error(f"OCR processing failed for {pdf_path.name}: {e}")
             return ""
 
-    def _enhance_image(self, image: Image.Image) -> Image.Image:
+    def _enhance_image(self, image: "Image.Image") -> "Image.Image":
         """Enhance image quality for better OCR results"""
         try:
             # Convert to grayscale for better OCR
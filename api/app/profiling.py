@@ -0,0 +1,206 @@
+"""
+Opt-in profiling hooks (PROFILING_ENABLED=1)
+- per-request profile: send `X-Profile: cprofile` (or `pyinstrument`) and get the profile back instead of the response
+- sampling profiler: GET /admin/profile?seconds=N returns collapsed stacks (flamegraph.pl / speedscope)
+Both require `X-Admin-Token: $PROFILING_TOKEN`; with no token configured they always answer 403.
+Nothing here is installed when disabled: main.py only wires it in behind the setting.
+(Ingest stage profiling lives in stage_profiler.py.)
+"""
+
+import asyncio
+import contextvars
+import cProfile
+import functools
+import hmac
+import io
+import pathlib
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+
+from fastapi import APIRouter, Header, HTTPException, Query, Request
+from fastapi.responses import HTMLResponse, PlainTextResponse
+from fastapi.routing import APIRoute
+
+from .settings import settings
+
+PROFILE_HEADER = "x-profile"
+TOKEN_HEADER = "x-admin-token"
+ENGINES = ("cprofile", "pyinstrument")
+
+# Profiler for the current request, visible to the threadpool thread running a sync endpoint
+_request_profiler: contextvars.ContextVar = contextvars.ContextVar("request_profiler", default=None)
+# One profiled request at a time per process: profilers on the loop thread can't nest
+_profile_lock = threading.Lock()
+
+
+def _authorized(token: str) -> bool:
+    # fail closed: no PROFILING_TOKEN configured -> nobody is authorized
+    expected = settings.profiling_token
+    if not expected or not token:
+        return False
+    return hmac.compare_digest(token.encode("utf-8"), expected.encode("utf-8"))
+
+
+# ==== Per-request profiling ====
+
+def _wrap_endpoint(endpoint):
+    # Sync endpoints run in a worker thread; cProfile/pyinstrument only see the thread they
+    # are enabled in, so the endpoint body gets its own profiler there.
+    if asyncio.iscoroutinefunction(endpoint):
+        return endpoint
+
+    @functools.wraps(endpoint)
+    def wrapper(*args, **kwargs):
+        prof = _request_profiler.get()
+        if prof is None:
+            return endpoint(*args, **kwargs)
+        if isinstance(prof, cProfile.Profile):
+            try:
+                prof.enable()
+            except ValueError:
+                # Python 3.12+: cProfile is process-wide, the loop-side profiler already sees this thread
+                return endpoint(*args, **kwargs)
+            try:
+                return endpoint(*args, **kwargs)
+            finally:
+                prof.disable()
+        prof.start()
+        try:
+            return endpoint(*args, **kwargs)
+        finally:
+            prof.stop()
+
+    return wrapper
+
+
+class ProfilingRoute(APIRoute):
+    def __init__(self, path: str, endpoint, **kwargs):
+        super().__init__(path, _wrap_endpoint(endpoint), **kwargs)
+
+
+async def profile_request_middleware(request: Request, call_next):
+    engine = request.headers.get(PROFILE_HEADER, "").lower()
+    if not engine:
+        return await call_next(request)
+    if engine not in ENGINES:
+        return PlainTextResponse(f"X-Profile must be one of: {', '.join(ENGINES)}", status_code=400)
+    if not _authorized(request.headers.get(TOKEN_HEADER, "")):
+        return PlainTextResponse("invalid admin token", status_code=403)
+    if not _profile_lock.acquire(blocking=False):
+        return PlainTextResponse("another request is being profiled", status_code=409)
+    try:
+        return await _profile_request(request, call_next, engine)
+    finally:
+        _profile_lock.release()
+
+
+async def _profile_request(request: Request, call_next, engine: str):
+    if engine == "pyinstrument":
+        return await _profile_pyinstrument(request, call_next)
+
+    # cProfile: one profiler for the endpoint thread, one for the event loop side
+    # (routing, validation, response serialization). The loop-side one also sees
+    # other requests interleaved on the loop while this one awaits.
+    worker_prof, loop_prof = cProfile.Profile(), cProfile.Profile()
+    token = _request_profiler.set(worker_prof)
+    started = time.perf_counter()
+    loop_prof.enable()
+    try:
+        response = await call_next(request)
+    finally:
+        loop_prof.disable()
+        _request_profiler.reset(token)
+    elapsed = time.perf_counter() - started
+
+    out = io.StringIO()
+    stats = pstats.Stats(loop_prof, stream=out)
+    if worker_prof.getstats():
+        stats.add(worker_prof)
+    out.write(f"{request.method} {request.url.path} -> {response.status_code} in {elapsed*1000:.1f} ms\n\n")
+    stats.sort_stats("cumulative").print_stats(60)
+    return PlainTextResponse(out.getvalue(), headers={"X-Profile-Status": str(response.status_code)})
+
+
+async def _profile_pyinstrument(request: Request, call_next):
+    try:
+        from pyinstrument import Profiler
+        from pyinstrument.renderers import HTMLRenderer
+        from pyinstrument.session import Session
+    except ImportError:
+        return PlainTextResponse("pyinstrument is not installed", status_code=400)
+
+    # loop side (routing, validation, serialization, async endpoints) + the sync
+    # endpoint's worker thread, if the request got that far
+    # the worker thread inherits this request's context, so its profiler must not
+    # track async context or pyinstrument sees it as nested in the loop-side one
+    worker_prof, loop_prof = Profiler(async_mode="disabled"), Profiler(async_mode="enabled")
+    token = _request_profiler.set(worker_prof)
+    loop_prof.start()
+    try:
+        response = await call_next(request)
+    finally:
+        loop_prof.stop()
+        _request_profiler.reset(token)
+
+    session = loop_prof.last_session
+    if worker_prof.last_session is not None:
+        session = Session.combine(session, worker_prof.last_session) if session else worker_prof.last_session
+    if session is None:
+        return response
+    html = HTMLRenderer().render(session)
+    return HTMLResponse(html, headers={"X-Profile-Status": str(response.status_code)})
+
+
+# ==== Sampling profiler ====
+
+def _frame_key(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({pathlib.Path(code.co_filename).name}:{frame.f_lineno})"
+
+
+def sample_stacks(seconds: float, interval: float = 0.005) -> Counter:
+    """
+    Sample every thread's Python stack for `seconds`.
+    Returns collapsed stacks: {"thread;outer;...;inner": n_samples}
+    """
+    me = threading.get_ident()
+    names = {}
+    counts: Counter = Counter()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        for ident, frame in sys._current_frames().items():
+            if ident == me:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_frame_key(frame))
+                frame = frame.f_back
+            if ident not in names:
+                names = {t.ident: t.name for t in threading.enumerate()}
+            stack.append(names.get(ident, str(ident)))
+            counts[";".join(reversed(stack))] += 1
+        time.sleep(interval)
+    return counts
+
+
+def collapsed(counts: Counter) -> str:
+    # Brendan Gregg's folded format: "a;b;c 42" per line
+    return "\n".join(f"{stack} {n}" for stack, n in counts.most_common()) + "\n"
+
+
+admin_router = APIRouter(prefix="/admin")
+
+
+@admin_router.get("/profile", response_class=PlainTextResponse)
+def sampling_profile(
+    seconds: float = Query(10.0, gt=0, le=120),
+    interval_ms: float = Query(5.0, ge=1, le=1000),
+    x_admin_token: str = Header(""),
+):
+    """Sample this worker's threads for N seconds; returns collapsed stacks"""
+    if not _authorized(x_admin_token):
+        raise HTTPException(status_code=403, detail="invalid admin token")
+    return collapsed(sample_stacks(seconds, interval=interval_ms / 1000.0))
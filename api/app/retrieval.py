@@ -1,11 +1,19 @@
 from typing import List, Dict, Tuple
+import psycopg
 from .db import get_conn
 from .llm import embed_texts
+from .settings import settings
+from .text_search import parse_query, to_tsquery
 
 # Cosine distance operator `<=>` in pgvector; we created a HNSW index with vector_cosine_ops
 
 
 def _vector_candidates(q_vec: List[float], limit: int = 40) -> List[Dict]:
+    if settings.vector_backend == "local":
+        # in-process exact search over a NumPy snapshot of chunks.embedding
+        from .vector_index import get_local_index
+        return get_local_index().search(q_vec, limit=limit)
+
     vec_literal = "[" + ",".join(f"{x:.6f}" for x in q_vec) + "]"
     sql = f"""
         SELECT id, document_id, chunk_index, content,
@@ -30,26 +38,44 @@ def _vector_candidates(q_vec: List[float], limit: int = 40) -> List[Dict]:
 
 
 def _keyword_candidates(query: str, limit: int = 20) -> List[Dict]:
-    # Try full-text first; fallback to trigram similarity
-    sql_fts = """
-        SELECT id, document_id, chunk_index, content, ts_rank(content_tsv, plainto_tsquery('simple', %s)) AS score
-        FROM chunks
-        WHERE content_tsv @@ plainto_tsquery('simple', %s)
-        ORDER BY score DESC
-        LIMIT %s
-    """
-    with get_conn() as conn:
-        rows = conn.execute(sql_fts, (query, query, limit)).fetchall()
-        if not rows:
-            sql_trgm = """
-            SELECT id, document_id, chunk_index, content, similarity(content, %s) AS score
+    # Diacritic-insensitive full-text on the precomputed content_norm_tsv (GIN);
+    # trigram similarity on content_norm runs only if full-text finds nothing,
+    # inside the same statement (one round trip)
+    parsed = parse_query(query)
+    if parsed.is_empty():
+        return []
+    sql = """
+        WITH fts AS (
+            SELECT id, document_id, chunk_index, content,
+                   ts_rank_cd(content_norm_tsv, to_tsquery('vn_unaccent', %(tsq)s)) AS score
+            FROM chunks
+            WHERE content_norm_tsv @@ to_tsquery('vn_unaccent', %(tsq)s)
+            ORDER BY score DESC
+            LIMIT %(limit)s
+        ),
+        trgm AS (
+            SELECT id, document_id, chunk_index, content,
+                   word_similarity(%(norm)s, content_norm) AS score
             FROM chunks
-            WHERE content ILIKE %s
+            WHERE NOT EXISTS (SELECT 1 FROM fts)
+              AND %(norm)s <%% content_norm
             ORDER BY score DESC
-            LIMIT %s
-            """
-            rows = conn.execute(
-                sql_trgm, (query, f'%{query}%', limit)).fetchall()
+            LIMIT %(limit)s
+        )
+        SELECT * FROM fts
+        UNION ALL
+        SELECT * FROM trgm
+    """
+    params = {"tsq": to_tsquery(parsed), "norm": parsed.normalized, "limit": limit}
+    try:
+        with get_conn() as conn:
+            rows = conn.execute(sql, params).fetchall()
+    except psycopg.OperationalError:
+        if settings.vector_backend != "local":
+            raise
+        # DB unreachable: degrade to token matching over the local snapshot texts
+        from .vector_index import get_local_index
+        return get_local_index().keyword_search(query, limit=limit)
     return [
         {
             "id": r[0],
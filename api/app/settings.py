@@ -9,22 +9,46 @@ class Settings:
 	pg_db: str = os.getenv("PGDATABASE", "rag")
 	pg_user: str = os.getenv("PGUSER", "rag")
 	pg_password: str = os.getenv("PGPASSWORD", "ragpw")
+	pg_connect_timeout: int = int(os.getenv("PGCONNECT_TIMEOUT", "5"))  # seconds
 
 
 	openai_api_key: str = os.getenv("OPENAI_API_KEY", "")
 	openai_embed_model: str = os.getenv("OPENAI_EMBED_MODEL", "text-embedding-3-small")
+	embed_dim: int = int(os.getenv("EMBED_DIM", "1536"))  # must match chunks.embedding vector(N)
+	openai_base_url: str = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1")
 
 
 	cohere_api_key: str = os.getenv("COHERE_API_KEY", "")
 	cohere_rerank_model: str = os.getenv("COHERE_RERANK_MODEL", "rerank-multilingual-v3.0")
+	cohere_base_url: str = os.getenv("COHERE_BASE_URL", "https://api.cohere.com")
 
 
 	google_api_key: str = os.getenv("GOOGLE_API_KEY", os.getenv("GEMINI_API_KEY", ""))
 	gemini_model: str = os.getenv("GEMINI_MODEL", "gemini-2.5-flash-lite")
+	gemini_base_url: str = os.getenv("GEMINI_BASE_URL", "")  # empty -> SDK default
 
 
 	chunk_size: int = int(os.getenv("CHUNK_SIZE", "1000"))
 	chunk_overlap: int = int(os.getenv("CHUNK_OVERLAP", "200"))
 
 
+	# Vector backend: "pgvector" (HNSW in Postgres) or "local" (in-process NumPy index)
+	vector_backend: str = os.getenv("VECTOR_BACKEND", "pgvector")
+	local_index_path: str = os.getenv("LOCAL_INDEX_PATH", "/data/index/chunks")
+	local_index_dtype: str = os.getenv("LOCAL_INDEX_DTYPE", "float32")
+	local_index_refresh_secs: int = int(os.getenv("LOCAL_INDEX_REFRESH_SECS", "60"))
+
+
+	# Server (production profile: gunicorn + uvicorn workers, see gunicorn.conf.py)
+	db_pool_min_size: int = int(os.getenv("DB_POOL_MIN_SIZE", "1"))
+	db_pool_max_size: int = int(os.getenv("DB_POOL_MAX_SIZE", "10"))
+	db_pool_timeout: float = float(os.getenv("DB_POOL_TIMEOUT", "5"))  # seconds to wait for a free/new connection
+	warm_up: bool = os.getenv("WARM_UP", "1") not in ("0", "false", "False", "")
+
+
+	# Profiling (app/profiling.py): off by default, nothing is installed unless enabled
+	profiling_enabled: bool = os.getenv("PROFILING_ENABLED", "0") not in ("0", "false", "False", "")
+	profiling_token: str = os.getenv("PROFILING_TOKEN", "")  # required as X-Admin-Token when set
+
+
 settings = Settings()
\ No newline at end of file
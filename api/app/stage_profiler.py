@@ -0,0 +1,64 @@
+"""
+Per-stage CPU / memory profiling for batch jobs (`python -m app.ingest /data --profile`)
+Kept free of web-stack imports so CLI tools stay light.
+"""
+
+import cProfile
+import json
+import pathlib
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Optional
+
+
+class StageProfiler:
+    """
+    Accumulates CPU time, wall time, peak traced memory and a cProfile per named stage.
+    When disabled, stage() is a no-op context manager.
+    """
+
+    def __init__(self, out_dir: Optional[str] = None):
+        self.enabled = out_dir is not None
+        self.out_dir = pathlib.Path(out_dir) if out_dir else None
+        self.profiles: Dict[str, cProfile.Profile] = {}
+        self.totals: Dict[str, Dict[str, float]] = {}
+
+    def stage(self, name: str):
+        if not self.enabled:
+            return nullcontext()
+        return self._stage(name)
+
+    @contextmanager
+    def _stage(self, name: str):
+        prof = self.profiles.setdefault(name, cProfile.Profile())
+        totals = self.totals.setdefault(name, {"calls": 0, "cpu_s": 0.0, "wall_s": 0.0, "peak_mb": 0.0})
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        cpu, wall = time.process_time(), time.perf_counter()
+        prof.enable()
+        try:
+            yield
+        finally:
+            prof.disable()
+            _, peak = tracemalloc.get_traced_memory()
+            totals["calls"] += 1
+            totals["cpu_s"] += time.process_time() - cpu
+            totals["wall_s"] += time.perf_counter() - wall
+            totals["peak_mb"] = max(totals["peak_mb"], (peak - base) / 2**20)
+
+    def dump(self):
+        if not self.enabled:
+            return
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        print(f"\n{'stage':<10} {'calls':>6} {'cpu_s':>9} {'wall_s':>9} {'peak_mb':>9}")
+        for name, t in self.totals.items():
+            self.profiles[name].dump_stats(str(self.out_dir / f"ingest-{name}.prof"))
+            print(f"{name:<10} {t['calls']:>6} {t['cpu_s']:>9.2f} {t['wall_s']:>9.2f} {t['peak_mb']:>9.1f}")
+        # per-stage totals, machine-readable for comparing runs
+        (self.out_dir / "ingest-stages.json").write_text(json.dumps(self.totals, indent=2), encoding="utf-8")
+        print(f"Profiles written to {self.out_dir}/ingest-<stage>.prof (view with snakeviz / pstats), totals to ingest-stages.json")
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
@@ -0,0 +1,99 @@
+"""
+Vietnamese-aware keyword query parsing
+Turns a user query into a tsquery for the `vn_unaccent` configuration (db/init/02-keyword-search.sql)
+"""
+
+import re
+import unicodedata
+from dataclasses import dataclass, field
+from typing import List
+
+# Only [a-z0-9] (and a leading "-" on numbers) survive normalization, so tsquery
+# operators in user input can't leak through
+_TOKEN_RE = re.compile(r'"([^"]*)"|([^\s"]+)')
+# Postgres' default parser reads "-256" in "SHA-256" as a signed integer, not as
+# a hyphenated word part, and the `simple` dictionary keeps the sign:
+#   to_tsvector('vn_unaccent', 'SHA-256') -> 'sha':1 '-256':2
+_WORD_RE = re.compile(r"-[0-9]+(?![a-z0-9])|[a-z0-9]+")
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase and strip diacritics, mirroring vn_unaccent() in Postgres"""
+    # "Hàm Băm Đơn" -> "ham bam don"
+    text = (text or "").lower().replace("đ", "d")
+    decomposed = unicodedata.normalize("NFD", text)
+    return "".join(ch for ch in decomposed if unicodedata.category(ch) != "Mn")
+
+
+def tokenize(text: str) -> List[str]:
+    # "Hàm băm (SHA-256)" -> ["ham", "bam", "sha", "-256"]
+    return _WORD_RE.findall(normalize_text(text))
+
+
+@dataclass
+class ParsedQuery:
+    phrases: List[List[str]] = field(default_factory=list)  # "quoted text" -> must match in order
+    terms: List[str] = field(default_factory=list)  # free syllables, in order
+    prefix: str = ""  # trailing `term*`
+
+    @property
+    def normalized(self) -> str:
+        parts = [" ".join(p) for p in self.phrases] + self.terms
+        if self.prefix:
+            parts.append(self.prefix)
+        return " ".join(parts)
+
+    def is_empty(self) -> bool:
+        return not (self.phrases or self.terms or self.prefix)
+
+
+def parse_query(query: str) -> ParsedQuery:
+    # 'bảo mật "hàm băm" chữ ký*' -> phrases=[["ham","bam"]], terms=["bao","mat","chu"], prefix="ky"
+    parsed = ParsedQuery()
+    matches = list(_TOKEN_RE.finditer(query or ""))
+    for pos, m in enumerate(matches):
+        if m.group(1) is not None:
+            words = tokenize(m.group(1))
+            if words:
+                parsed.phrases.append(words)
+            continue
+        raw = m.group(2)
+        words = tokenize(raw)
+        if not words:
+            continue
+        if pos == len(matches) - 1 and raw.endswith("*"):
+            parsed.terms.extend(words[:-1])
+            parsed.prefix = words[-1]
+        else:
+            parsed.terms.extend(words)
+    return parsed
+
+
+def _phrase(words: List[str]) -> str:
+    return words[0] if len(words) == 1 else "(" + " <-> ".join(words) + ")"
+
+
+def to_tsquery(parsed: ParsedQuery) -> str:
+    """
+    Build a to_tsquery() string:
+    - quoted phrases are required (AND), syllables adjacent (<->)
+    - free text matches any adjacent syllable pair (Vietnamese words are mostly
+      2 syllables: "ham <-> bam", "bao <-> mat") or any single syllable; chunks
+      containing the pairs score higher in ts_rank_cd
+    - trailing `term*` becomes a prefix match (term:*)
+    """
+    # "rsa la gi" -> "((rsa <-> la) | (la <-> gi) | rsa | la | gi)"
+    clauses = [_phrase(p) for p in parsed.phrases]
+
+    free = list(parsed.terms)
+    if parsed.prefix:
+        free.append(parsed.prefix + ":*")
+    if len(free) == 1:
+        clauses.append(free[0])
+    elif free:
+        # single terms too, or a pair of function words ("la <-> gi") would be
+        # enough to match and hide chunks that only contain the actual keyword
+        bigrams = [f"({a} <-> {b})" for a, b in zip(free, free[1:])]
+        clauses.append("(" + " | ".join(bigrams + free) + ")")
+
+    return " & ".join(clauses)
@@ -0,0 +1,381 @@
+"""
+In-process vector index for small corpora (VECTOR_BACKEND=local)
+Keeps all chunk embeddings in one contiguous NumPy matrix, snapshotted to disk
+"""
+
+import fcntl
+import json
+import logging
+import os
+import pathlib
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import List, Dict, Optional
+
+import numpy as np
+
+from .db import get_conn
+from .settings import settings
+from .text_search import parse_query, tokenize
+
+logger = logging.getLogger(__name__)
+
+# Snapshot layout (LOCAL_INDEX_PATH=/data/index/chunks):
+#   /data/index/chunks.current        -> name of the live version, e.g. "18c2f0a1b2c3d4e5-42"
+#   /data/index/chunks.<version>.npy  -> (n_chunks, dim) matrix, rows L2-normalized
+#   /data/index/chunks.<version>.json -> {"version", "dtype", "dim", "ids", "document_ids", "chunk_indexes", "texts"}
+#   /data/index/chunks.lock           -> held by the one process writing a new version
+# Versioned files are written once and never modified; switching the `.current`
+# pointer (atomic rename) is what publishes a snapshot, so a reader always gets
+# a matrix and ids from the same version.
+
+_EMPTY_STATE = (None, np.empty(0, dtype=np.int64), [], [], [])
+_DTYPES = ("float32", "float16")
+
+
+def _parse_vector(literal: str) -> List[float]:
+    # pgvector text output: "[0.012346,-0.001235,...]" is valid JSON
+    return json.loads(literal)
+
+
+def _normalize(mat: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(mat, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return mat / norms
+
+
+def _atomic_write(path: pathlib.Path, write) -> None:
+    # unique temp file in the same directory, then rename over the target
+    with tempfile.NamedTemporaryFile(dir=path.parent, prefix=path.name + ".", suffix=".tmp", delete=False) as f:
+        tmp = pathlib.Path(f.name)
+        try:
+            write(f)
+        except BaseException:
+            f.close()
+            tmp.unlink(missing_ok=True)
+            raise
+    tmp.replace(path)
+
+
+class LocalVectorIndex:
+    """Exact cosine top-k over an in-memory (memory-mapped) embedding matrix"""
+
+    def __init__(self, path: str, dtype: str = "float32", dim: int = 1536, refresh_secs: int = 60):
+        base = pathlib.Path(path)
+        self.dir = base.parent
+        self.name = base.name
+        self.current_path = self.dir / f"{self.name}.current"
+        self.lock_path = self.dir / f"{self.name}.lock"
+        self.dtype = np.dtype(dtype)
+        if self.dtype not in _DTYPES:
+            raise ValueError(f"LOCAL_INDEX_DTYPE must be one of {', '.join(_DTYPES)}, got {dtype!r}")
+        self.dim = dim
+        self.refresh_secs = refresh_secs
+
+        self._lock = threading.Lock()
+        self._last_refresh: Optional[float] = None
+        self._version: Optional[str] = None
+        self._rejected: Optional[str] = None  # published version that failed validation
+        # (matrix, ids, document_ids, chunk_indexes, texts) swapped as one tuple,
+        # so a search running during refresh always sees a consistent view
+        self._state = _EMPTY_STATE
+        self._token_cache = (None, [])  # (texts list it was built from, token sets)
+
+        self._load_snapshot()
+
+    def _version_paths(self, version: str):
+        return self.dir / f"{self.name}.{version}.npy", self.dir / f"{self.name}.{version}.json"
+
+    # ---- snapshot ----
+
+    def _load_snapshot(self, match: Optional[tuple] = None) -> bool:
+        """
+        Load the published snapshot if it is newer than ours and matches dtype/dim.
+        With match=(count, max_id) it is only swapped in if it covers exactly those chunks.
+        """
+        try:
+            version = self.current_path.read_text(encoding="utf-8").strip()
+        except FileNotFoundError:
+            return False
+        if not version or version in (self._version, self._rejected):
+            return False
+        matrix_path, meta_path = self._version_paths(version)
+        try:
+            matrix = np.load(matrix_path, mmap_mode="r")
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        except Exception as e:
+            logger.warning(f"Could not load vector snapshot {version}: {e}")
+            self._rejected = version
+            return False
+        if (
+            meta.get("version") != version
+            or matrix.ndim != 2
+            or matrix.shape[0] != len(meta["ids"])
+            or matrix.dtype != self.dtype
+            or matrix.shape[1] != self.dim
+        ):
+            logger.warning(
+                f"Vector snapshot {version} ({matrix.dtype}, shape {matrix.shape}) does not match "
+                f"LOCAL_INDEX_DTYPE={self.dtype.name} / EMBED_DIM={self.dim}; it will be rebuilt"
+            )
+            self._rejected = version
+            return False
+        ids = np.asarray(meta["ids"], dtype=np.int64)
+        if match is not None and match != (len(ids), int(ids[-1]) if len(ids) else 0):
+            # valid, just not the chunks we are at; a later refresh may still pick it up
+            return False
+        self._state = (matrix, ids, meta["document_ids"], meta["chunk_indexes"], meta["texts"])
+        self._version = version
+        logger.info(f"Loaded vector snapshot {version}: {matrix.shape[0]} chunks")
+        return True
+
+    def _is_mapped(self) -> bool:
+        return isinstance(self._state[0], np.memmap)
+
+    def _save_snapshot(self):
+        # caller holds the writer lock
+        matrix, ids, document_ids, chunk_indexes, texts = self._state
+        version = f"{time.time_ns():x}-{os.getpid()}"
+        matrix_path, meta_path = self._version_paths(version)
+        meta = {
+            "version": version,
+            "dtype": self.dtype.name,
+            "dim": self.dim,
+            "ids": ids.tolist(),
+            "document_ids": document_ids,
+            "chunk_indexes": chunk_indexes,
+            "texts": texts,
+        }
+        _atomic_write(matrix_path, lambda f: np.save(f, np.ascontiguousarray(matrix)))
+        _atomic_write(meta_path, lambda f: f.write(json.dumps(meta, ensure_ascii=False).encode("utf-8")))
+        _atomic_write(self.current_path, lambda f: f.write(version.encode("utf-8")))
+        self._prune(keep={version, self._version})
+        # serve the published file (page cache shared by every worker) instead of the private copy
+        self._load_snapshot(match=(len(ids), int(ids[-1]) if len(ids) else 0))
+
+    def _prune(self, keep: set):
+        # Old versions may still be memory-mapped by other workers; unlinking is safe on POSIX
+        for path in self.dir.glob(f"{self.name}.*.npy"):
+            version = path.name[len(self.name) + 1:-len(".npy")]
+            if version not in keep:
+                for p in self._version_paths(version):
+                    p.unlink(missing_ok=True)
+
+    @contextmanager
+    def _writer_lock(self):
+        # Only one process (gunicorn worker, ingest, ...) writes snapshots; the others
+        # sync in memory and pick the published version up on their next refresh.
+        self.dir.mkdir(parents=True, exist_ok=True)
+        with open(self.lock_path, "a") as f:
+            try:
+                fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    # ---- refresh from Postgres ----
+
+    def _refresh_due(self) -> bool:
+        if self._last_refresh is None:
+            return True
+        return time.monotonic() - self._last_refresh >= self.refresh_secs
+
+    def _in_sync(self, count: int, max_id: int) -> bool:
+        ids = self._state[1]
+        last_id = int(ids[-1]) if len(ids) else 0
+        return count == len(ids) and max_id == last_id
+
+    def _fetch_rows(self, after_id: int = 0) -> list:
+        sql = """
+            SELECT id, document_id, chunk_index, content, embedding::text
+            FROM chunks
+            WHERE embedding IS NOT NULL AND id > %s
+            ORDER BY id
+        """
+        with get_conn() as conn:
+            return conn.execute(sql, (after_id,)).fetchall()
+
+    def _append_rows(self, rows: list, reset: bool = False):
+        vectors = np.asarray([_parse_vector(r[4]) for r in rows], dtype=np.float32)
+        if vectors.shape[1] != self.dim:
+            raise ValueError(f"chunks.embedding has {vectors.shape[1]} dims, EMBED_DIM={self.dim}")
+        vectors = _normalize(vectors).astype(self.dtype)
+        ids = np.asarray([r[0] for r in rows], dtype=np.int64)
+        matrix, old_ids, document_ids, chunk_indexes, texts = self._state
+        if reset or matrix is None or len(old_ids) == 0:
+            matrix, old_ids, document_ids, chunk_indexes, texts = None, ids[:0], [], [], []
+        self._state = (
+            np.ascontiguousarray(vectors) if matrix is None else np.vstack([np.asarray(matrix), vectors]),
+            np.concatenate([old_ids, ids]),
+            document_ids + [r[1] for r in rows],
+            chunk_indexes + [r[2] for r in rows],
+            texts + [r[3] for r in rows],
+        )
+
+    def _sync_from_db(self, count: int) -> bool:
+        """Bring the in-memory state up to the chunks table; returns True if it changed"""
+        loaded = len(self._state[1])
+        last_id = int(self._state[1][-1]) if loaded else 0
+        if count > loaded:
+            rows = self._fetch_rows(after_id=last_id)
+            if rows and loaded + len(rows) == count:
+                self._append_rows(rows)
+                logger.info(f"Vector index: +{len(rows)} chunks")
+                return True
+        # deletions / re-ingestion: ids no longer line up -> full rebuild
+        rows = self._fetch_rows()
+        if rows:
+            self._append_rows(rows, reset=True)
+        else:
+            self._state = _EMPTY_STATE
+        logger.info(f"Vector index: rebuilt with {len(rows)} chunks")
+        return bool(rows)
+
+    def refresh(self, force: bool = False):
+        """
+        Sync with the chunks table:
+        - a snapshot already published by another process is loaded first
+        - new chunks (id > last loaded id) are appended
+        - deletions / re-ingestion (ids don't line up) trigger a full rebuild
+        - the writer publishes the result; every process then serves the published,
+          memory-mapped file, so N workers share one copy of the matrix
+        Keeps serving the current snapshot if Postgres is unreachable.
+        """
+        if not force and not self._refresh_due():
+            return
+        with self._lock:
+            if not force and not self._refresh_due():
+                return
+            self._last_refresh = time.monotonic()
+            try:
+                with get_conn() as conn:
+                    count, max_id = conn.execute(
+                        "SELECT count(*), coalesce(max(id), 0) FROM chunks WHERE embedding IS NOT NULL"
+                    ).fetchone()
+                if self._in_sync(count, max_id):
+                    # synced in memory earlier: switch to the published copy once there is one
+                    if self._state[0] is not None and not self._is_mapped():
+                        self._load_snapshot(match=(count, max_id))
+                    return
+                if self._load_snapshot(match=(count, max_id)):
+                    return
+                with self._writer_lock() as is_writer:
+                    # re-check: the previous writer may have just published
+                    if is_writer and self._load_snapshot(match=(count, max_id)):
+                        return
+                    if self._sync_from_db(count) and is_writer:
+                        self._save_snapshot()
+            except Exception as e:
+                logger.warning(f"Vector index refresh failed, serving snapshot: {e}")
+
+    def _refresh_in_background(self):
+        # Queries never wait on Postgres once there is something to serve
+        if not self._refresh_due() or self._lock.locked():
+            return
+        threading.Thread(target=self.refresh, name="vector-index-refresh", daemon=True).start()
+
+    # ---- query ----
+
+    def search(self, q_vec: List[float], limit: int = 40) -> List[Dict]:
+        if self._state[0] is None:
+            self.refresh()
+        else:
+            self._refresh_in_background()
+        matrix, ids, document_ids, chunk_indexes, texts = self._state
+        if matrix is None or len(ids) == 0:
+            return []
+        q = np.asarray(q_vec, dtype=np.float32)
+        q_norm = np.linalg.norm(q)
+        if q_norm > 0:
+            q = q / q_norm
+        # rows are unit vectors, so dot product == 1 - cosine distance (same score as pgvector)
+        # float16 halves memory at ~1e-3 score precision
+        scores = matrix @ q.astype(matrix.dtype)
+        k = min(limit, len(ids))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [
+            {
+                "id": int(ids[i]),
+                "document_id": document_ids[i],
+                "chunk_index": chunk_indexes[i],
+                "text": texts[i],
+                "score": float(scores[i]),
+                "meta": {"document_id": document_ids[i], "chunk_index": chunk_indexes[i]}
+            }
+            for i in top
+        ]
+
+    def _token_sets(self, texts: List[str]) -> List[set]:
+        cached_texts, token_sets = self._token_cache
+        if cached_texts is not texts:
+            token_sets = [set(tokenize(t)) for t in texts]
+            self._token_cache = (texts, token_sets)
+        return token_sets
+
+    def keyword_search(self, query: str, limit: int = 20) -> List[Dict]:
+        """
+        Offline stand-in for Postgres keyword search, over the snapshot texts:
+        score = fraction of query syllables present; quoted phrases must be fully present
+        """
+        matrix, ids, document_ids, chunk_indexes, texts = self._state
+        parsed = parse_query(query)
+        if parsed.is_empty() or not texts:
+            return []
+        required = {w for p in parsed.phrases for w in p}
+        wanted = required | set(parsed.terms)
+        hits = []
+        for i, tokens in enumerate(self._token_sets(texts)):
+            if not required <= tokens:
+                continue
+            matched = len(wanted & tokens)
+            if parsed.prefix and any(t.startswith(parsed.prefix) for t in tokens):
+                matched += 1
+            if matched:
+                hits.append((matched / (len(wanted) + bool(parsed.prefix)), i))
+        hits.sort(key=lambda h: -h[0])
+        return [
+            {
+                "id": int(ids[i]),
+                "document_id": document_ids[i],
+                "chunk_index": chunk_indexes[i],
+                "text": texts[i],
+                "score": score,
+                "meta": {"document_id": document_ids[i], "chunk_index": chunk_indexes[i]}
+            }
+            for score, i in hits[:limit]
+        ]
+
+
+_index: Optional[LocalVectorIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_local_index() -> LocalVectorIndex:
+    # Built on first use so the pgvector backend never pays for it
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = LocalVectorIndex(
+                    settings.local_index_path,
+                    dtype=settings.local_index_dtype,
+                    dim=settings.embed_dim,
+                    refresh_secs=settings.local_index_refresh_secs,
+                )
+    return _index
+
+
+if __name__ == "__main__":
+    # Build/refresh the snapshot now, e.g. before shipping it to an offline machine:
+    #   python -m app.vector_index
+    logging.basicConfig(level=logging.INFO)
+    index = get_local_index()
+    index.refresh(force=True)
+    print(f"Vector snapshot {index._version}: {len(index._state[1])} chunks in {index.dir}")
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Startup-time benchmark
+Measures cold import of the API app and the lifespan warm-up (clients + DB pool)
+
+Usage:
+  python bench_startup.py                 # 5 runs
+  python bench_startup.py --runs 10
+  docker compose exec api python bench_startup.py
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+# Each run is a fresh interpreter, like a new worker / autoscaled container
+PROBE = r"""
+import asyncio, json, sys, time
+t0 = time.perf_counter()
+from app.main import app
+t1 = time.perf_counter()
+
+async def boot():
+    async with app.router.lifespan_context(app):
+        pass
+
+asyncio.run(boot())
+t2 = time.perf_counter()
+heavy = [m for m in ("openai", "cohere", "google.genai", "pdf2image", "pytesseract", "pdfminer", "numpy") if m in sys.modules]
+print(json.dumps({"import": t1 - t0, "warm_up": t2 - t1, "loaded": heavy}))
+"""
+
+
+def run_once() -> dict:
+    import json
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE], capture_output=True, text=True, check=True
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    results = []
+    for i in range(args.runs):
+        r = run_once()
+        results.append(r)
+        print(f"  run {i+1}: import {r['import']*1000:.0f} ms, warm-up {r['warm_up']*1000:.0f} ms")
+
+    imports = [r["import"] for r in results]
+    warms = [r["warm_up"] for r in results]
+    print("\n📊 Startup (median of %d runs)" % args.runs)
+    print(f"  import app.main : {statistics.median(imports)*1000:.0f} ms")
+    print(f"  lifespan warm-up: {statistics.median(warms)*1000:.0f} ms")
+    print(f"  total           : {statistics.median([a + b for a, b in zip(imports, warms)])*1000:.0f} ms")
+    print(f"  modules loaded  : {', '.join(results[-1]['loaded']) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
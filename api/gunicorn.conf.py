@@ -0,0 +1,37 @@
+"""
+Production server profile: gunicorn master + uvicorn workers
+Usage:
+  gunicorn -c gunicorn.conf.py app.main:app
+  docker compose --profile prod up -d api-prod
+"""
+
+import multiprocessing
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", str(min(multiprocessing.cpu_count() * 2 + 1, 8))))
+worker_class = "uvicorn_worker.UvicornWorker"
+
+# Import the app once in the master and fork: modules are shared copy-on-write and
+# each worker boots without re-importing. The provider SDKs are not imported by
+# app.main (they load lazily), so on_starting imports them in the master too.
+# Clients and the DB pool are *not* built here - the FastAPI lifespan creates
+# them in every worker after fork.
+preload_app = True
+
+
+def on_starting(server):
+    from app.llm import preload_sdks
+    preload_sdks()
+
+timeout = int(os.getenv("WORKER_TIMEOUT", "120"))  # /ask waits on embeddings + rerank + generation
+graceful_timeout = int(os.getenv("GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("KEEPALIVE", "5"))
+
+# Recycle workers periodically to cap memory growth
+max_requests = int(os.getenv("MAX_REQUESTS", "2000"))
+max_requests_jitter = int(os.getenv("MAX_REQUESTS_JITTER", "200"))
+
+accesslog = "-"
+errorlog = "-"
+loglevel = os.getenv("LOG_LEVEL", "info")
@@ -0,0 +1,9 @@
+"""
+Load-testing harness for the API
+Runs the FastAPI app against local Postgres with stubbed OpenAI / Cohere / Gemini
+
+Usage (from api/):
+  python -m loadtest.seed --chunks 2000            # (re)seed synthetic chunks
+  python -m loadtest.run --mode closed --concurrency 16 --duration 30 --out report.json
+  python -m loadtest.run --mode open --rate 40 --duration 30 --baseline baseline.json
+"""
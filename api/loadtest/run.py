@@ -0,0 +1,242 @@
+"""
+Drive open- or closed-loop load against the API and emit a JSON report
+(throughput + p50/p95/p99 per endpoint), optionally compared to a stored baseline
+
+  closed loop: --concurrency N clients, each sends its next request when the previous returns
+  open loop:   --rate R requests/s on a fixed schedule, independent of response times;
+               latency counts from the scheduled send time (no coordinated omission)
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+from .seed import QUERIES
+from .stubs import Latency, start_stubs, stub_env
+
+# (endpoint name, ok, latency seconds)
+Sample = Tuple[str, bool, float]
+
+
+# ---- app process ----
+
+def start_app(port: int, workers: int, env: Dict[str, str]) -> subprocess.Popen:
+    cmd = [sys.executable, "-m", "uvicorn", "app.main:app",
+           "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers),
+           "--log-level", "warning"]
+    return subprocess.Popen(cmd, env={**os.environ, **env})
+
+
+def wait_ready(base_url: str, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if requests.get(base_url + "/health", timeout=2).json().get("ok"):
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError(f"API at {base_url} not healthy after {timeout:.0f}s")
+
+
+# ---- requests ----
+
+_local = threading.local()
+
+
+def _session() -> requests.Session:
+    if not hasattr(_local, "session"):
+        _local.session = requests.Session()
+    return _local.session
+
+
+def _pick(rng: random.Random, health_share: float) -> Tuple[str, str, Optional[dict]]:
+    if rng.random() < health_share:
+        return "GET /health", "/health", None
+    return "POST /ask", "/ask", {"query": rng.choice(QUERIES)}
+
+
+def _send(base_url: str, name: str, path: str, body: Optional[dict], started: float) -> Sample:
+    try:
+        if body is None:
+            resp = _session().get(base_url + path, timeout=60)
+        else:
+            resp = _session().post(base_url + path, json=body, timeout=60)
+        ok = resp.status_code == 200
+    except requests.RequestException:
+        ok = False
+    return name, ok, time.perf_counter() - started
+
+
+def closed_loop(base_url: str, concurrency: int, duration: float, health_share: float) -> List[Sample]:
+    samples: List[Sample] = []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def client(i: int):
+        rng = random.Random(i)
+        local: List[Sample] = []
+        while time.perf_counter() < deadline:
+            name, path, body = _pick(rng, health_share)
+            local.append(_send(base_url, name, path, body, time.perf_counter()))
+        with lock:
+            samples.extend(local)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return samples
+
+
+def open_loop(base_url: str, rate: float, duration: float, health_share: float, max_inflight: int) -> List[Sample]:
+    rng = random.Random(0)
+    futures = []
+    start = time.perf_counter()
+    n = int(rate * duration)
+    with ThreadPoolExecutor(max_workers=max_inflight) as pool:
+        for i in range(n):
+            scheduled = start + i / rate
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            name, path, body = _pick(rng, health_share)
+            futures.append(pool.submit(_send, base_url, name, path, body, scheduled))
+        return [f.result() for f in futures]
+
+
+# ---- report ----
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    # nearest-rank
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(pct / 100.0 * len(sorted_values)) - 1, 0)
+    return sorted_values[rank]
+
+
+def summarize(samples: List[Sample], elapsed: float) -> Dict[str, dict]:
+    by_endpoint: Dict[str, List[Sample]] = {}
+    for s in samples:
+        by_endpoint.setdefault(s[0], []).append(s)
+    out = {}
+    for name, items in sorted(by_endpoint.items()):
+        lat = sorted(s[2] * 1000.0 for s in items if s[1])
+        errors = sum(1 for s in items if not s[1])
+        out[name] = {
+            "requests": len(items),
+            "errors": errors,
+            "throughput_rps": round(len(lat) / elapsed, 2) if elapsed else 0.0,
+            "p50_ms": round(_percentile(lat, 50), 1),
+            "p95_ms": round(_percentile(lat, 95), 1),
+            "p99_ms": round(_percentile(lat, 99), 1),
+        }
+    return out
+
+
+def compare(report: dict, baseline: dict, max_regression: float) -> List[str]:
+    """Return regressions beyond `max_regression` (0.2 = 20%) vs. the baseline report"""
+    failures = []
+    for name, base in baseline.get("endpoints", {}).items():
+        cur = report["endpoints"].get(name)
+        if cur is None:
+            failures.append(f"{name}: missing from this run")
+            continue
+        for key in ("p50_ms", "p95_ms", "p99_ms"):
+            if base[key] and cur[key] > base[key] * (1 + max_regression):
+                failures.append(f"{name} {key}: {cur[key]} > {base[key]} (+{max_regression:.0%} allowed)")
+        if base["throughput_rps"] and cur["throughput_rps"] < base["throughput_rps"] * (1 - max_regression):
+            failures.append(f"{name} throughput_rps: {cur['throughput_rps']} < {base['throughput_rps']}")
+        if cur["errors"] > base["errors"]:
+            failures.append(f"{name} errors: {cur['errors']} > {base['errors']}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mode", choices=["closed", "open"], default="closed")
+    parser.add_argument("--concurrency", type=int, default=8, help="closed loop: concurrent clients")
+    parser.add_argument("--rate", type=float, default=20.0, help="open loop: requests per second")
+    parser.add_argument("--max-inflight", type=int, default=256, help="open loop: client thread cap")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds")
+    parser.add_argument("--warmup", type=float, default=3.0, help="seconds of unrecorded load first")
+    parser.add_argument("--health-share", type=float, default=0.0, help="fraction of requests to /health")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--url", default="", help="target an already running API instead of spawning one")
+    parser.add_argument("--embed-latency-ms", type=float, default=80.0)
+    parser.add_argument("--rerank-latency-ms", type=float, default=120.0)
+    parser.add_argument("--gen-latency-ms", type=float, default=800.0)
+    parser.add_argument("--jitter", type=float, default=0.2, help="latency jitter as a fraction of the mean")
+    parser.add_argument("--out", default="", help="write JSON report here (default: stdout)")
+    parser.add_argument("--baseline", default="", help="JSON report to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.2)
+    args = parser.parse_args()
+
+    def latency(ms: float) -> Latency:
+        return Latency(mean_ms=ms, jitter_ms=ms * args.jitter)
+
+    stubs = start_stubs(latency(args.embed_latency_ms), latency(args.rerank_latency_ms), latency(args.gen_latency_ms))
+    app_proc = None
+    base_url = args.url.rstrip("/")
+    try:
+        if not base_url:
+            base_url = f"http://127.0.0.1:{args.port}"
+            app_proc = start_app(args.port, args.workers, stub_env(stubs))
+        wait_ready(base_url)
+
+        def drive(duration: float) -> List[Sample]:
+            if args.mode == "closed":
+                return closed_loop(base_url, args.concurrency, duration, args.health_share)
+            return open_loop(base_url, args.rate, duration, args.health_share, args.max_inflight)
+
+        if args.warmup > 0:
+            drive(args.warmup)
+        started = time.perf_counter()
+        samples = drive(args.duration)
+        elapsed = time.perf_counter() - started
+    finally:
+        if app_proc is not None:
+            app_proc.terminate()
+            app_proc.wait(timeout=30)
+        for s in stubs.values():
+            s.stop()
+
+    report = {
+        "config": {k: v for k, v in vars(args).items() if k not in ("out", "baseline")},
+        "elapsed_s": round(elapsed, 2),
+        "endpoints": summarize(samples, elapsed),
+        "stub_calls": {k: s.calls for k, s in stubs.items()},
+    }
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+        print(f"Report written to {args.out}")
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            failures = compare(report, json.load(f), args.max_regression)
+        if failures:
+            print("❌ Regressions vs baseline:")
+            for line in failures:
+                print(f"  - {line}")
+            sys.exit(1)
+        print("✓ Within baseline thresholds")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Seed local Postgres with synthetic chunks for load testing
+Embeddings come from stubs.fake_embedding, so vector search behaves like in production
+"""
+
+import argparse
+import random
+from typing import List
+
+from app.db import get_conn
+from app.ingest import _upsert_document, _insert_chunks
+from .stubs import fake_embedding
+
+SOURCE_PREFIX = "loadtest://"
+
+_WORDS = (
+    "hàm băm chữ ký số mã hóa bất đối xứng khóa công khai bí mật bảo mật dữ liệu "
+    "thuật toán chứng thư xác thực toàn vẹn tài liệu hệ thống mạng giao thức "
+    "RSA SHA-256 AES elliptic curve signature certificate"
+).split()
+
+QUERIES = [
+    "hàm băm là gì",
+    "ham bam va chu ky so",
+    "So sánh mã hóa đối xứng và bất đối xứng",
+    "RSA hoạt động như thế nào?",
+    "Tài liệu này nói gì về bảo mật dữ liệu?",
+    '"chữ ký số" xác thực',
+]
+
+
+def _fake_chunk(rng: random.Random, words: int = 160) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(words))
+
+
+def seed(n_chunks: int, n_docs: int = 10, seed_value: int = 42, append: bool = False):
+    rng = random.Random(seed_value)
+    per_doc = max(n_chunks // n_docs, 1)
+    with get_conn() as conn:
+        with conn.transaction():
+            # replace the previous loadtest corpus by default, so re-runs measure the same size
+            if not append:
+                conn.execute("DELETE FROM documents WHERE source LIKE %s", (SOURCE_PREFIX + "%",))
+            for d in range(n_docs):
+                doc_id = _upsert_document(conn, f"{SOURCE_PREFIX}doc-{d}", f"loadtest-{d}")
+                chunks: List[str] = [_fake_chunk(rng) for _ in range(per_doc)]
+                _insert_chunks(conn, doc_id, chunks, [fake_embedding(c) for c in chunks])
+    print(f"Seeded {per_doc * n_docs} chunks in {n_docs} documents")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chunks", type=int, default=2000)
+    parser.add_argument("--docs", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--append", action="store_true", help="Keep previously seeded loadtest documents")
+    args = parser.parse_args()
+    seed(args.chunks, n_docs=args.docs, seed_value=args.seed, append=args.append)
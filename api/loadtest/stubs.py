@@ -0,0 +1,172 @@
+"""
+In-process stub servers for provider APIs, with configurable latency injection
+- OpenAI   POST /v1/embeddings
+- Cohere   POST /v1/rerank
+- Gemini   POST /v1beta/models/{model}:generateContent
+"""
+
+import hashlib
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+
+from app.settings import settings
+
+
+def fake_embedding(text: str, dim: Optional[int] = None) -> List[float]:
+    # Deterministic per text, so seeded chunks and queries live in the same space
+    # dim defaults to EMBED_DIM, i.e. the chunks.embedding vector(N) the app expects
+    dim = dim or settings.embed_dim
+    seed = int.from_bytes(hashlib.sha1(text.encode("utf-8")).digest()[:8], "big")
+    rng = random.Random(seed)
+    return [rng.uniform(-1.0, 1.0) for _ in range(dim)]
+
+
+@dataclass
+class Latency:
+    mean_ms: float = 0.0
+    jitter_ms: float = 0.0
+
+    def sleep(self):
+        delay = self.mean_ms + random.uniform(-self.jitter_ms, self.jitter_ms)
+        if delay > 0:
+            time.sleep(delay / 1000.0)
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass  # keep load-test output readable
+
+    def _send_json(self, payload: dict, status: int = 200):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        data = json.loads(self.rfile.read(length) or b"{}")
+        server = self.server
+        server.latency.sleep()
+        with server.lock:
+            server.calls += 1
+        self._send_json(server.respond(self.path, data))
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    name = "stub"
+
+    def __init__(self, latency: Optional[Latency] = None, host: str = "127.0.0.1", port: int = 0):
+        super().__init__((host, port), _StubHandler)
+        self.latency = latency or Latency()
+        self.lock = threading.Lock()
+        self.calls = 0
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def respond(self, path: str, data: dict) -> dict:
+        raise NotImplementedError
+
+    def start(self) -> "StubServer":
+        self._thread = threading.Thread(target=self.serve_forever, name=self.name, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+class OpenAIStub(StubServer):
+    name = "openai-stub"
+
+    @property
+    def base_url(self) -> str:
+        return self.url + "/v1"
+
+    def respond(self, path: str, data: dict) -> dict:
+        texts = data.get("input") or []
+        if isinstance(texts, str):
+            texts = [texts]
+        return {
+            "object": "list",
+            "model": data.get("model", "stub"),
+            "data": [
+                {"object": "embedding", "index": i, "embedding": fake_embedding(t)}
+                for i, t in enumerate(texts)
+            ],
+            "usage": {"prompt_tokens": 0, "total_tokens": 0},
+        }
+
+
+class CohereStub(StubServer):
+    name = "cohere-stub"
+
+    @property
+    def base_url(self) -> str:
+        return self.url
+
+    def respond(self, path: str, data: dict) -> dict:
+        docs = data.get("documents") or []
+        top_n = min(int(data.get("top_n") or len(docs)), len(docs))
+        return {
+            "id": "stub",
+            "results": [
+                {"index": i, "relevance_score": 1.0 - i / max(len(docs), 1)}
+                for i in range(top_n)
+            ],
+            "meta": {"api_version": {"version": "1"}},
+        }
+
+
+class GeminiStub(StubServer):
+    name = "gemini-stub"
+
+    @property
+    def base_url(self) -> str:
+        return self.url + "/"
+
+    def respond(self, path: str, data: dict) -> dict:
+        return {
+            "candidates": [
+                {
+                    "content": {"role": "model", "parts": [{"text": "Câu trả lời giả lập (stub). Nguồn: [stub]"}]},
+                    "finishReason": "STOP",
+                    "index": 0,
+                }
+            ],
+            "usageMetadata": {"promptTokenCount": 0, "candidatesTokenCount": 0, "totalTokenCount": 0},
+        }
+
+
+def start_stubs(embed: Latency, rerank: Latency, generate: Latency) -> dict:
+    return {
+        "openai": OpenAIStub(embed).start(),
+        "cohere": CohereStub(rerank).start(),
+        "gemini": GeminiStub(generate).start(),
+    }
+
+
+def stub_env(stubs: dict) -> dict:
+    # Environment for the app process: real SDK code paths, stubbed endpoints
+    return {
+        "OPENAI_API_KEY": "stub",
+        "OPENAI_BASE_URL": stubs["openai"].base_url,
+        "COHERE_API_KEY": "stub",
+        "COHERE_BASE_URL": stubs["cohere"].base_url,
+        "GOOGLE_API_KEY": "stub",
+        "GEMINI_BASE_URL": stubs["gemini"].base_url,
+    }
@@ -0,0 +1,5 @@
+import pathlib
+import sys
+
+# make `app` importable when pytest runs from the repo root or from api/
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
@@ -0,0 +1,82 @@
+import pytest
+
+from loadtest.run import _percentile, compare, summarize
+from loadtest.stubs import fake_embedding
+from app.settings import settings
+
+
+@pytest.mark.parametrize("pct, expected", [(0, 1), (1, 1), (10, 1), (11, 2), (50, 5), (95, 10), (99, 10), (100, 10)])
+def test_percentile_nearest_rank(pct, expected):
+    assert _percentile(list(range(1, 11)), pct) == expected
+
+
+def test_percentile_edge_cases():
+    assert _percentile([], 99) == 0.0
+    assert _percentile([7.0], 50) == 7.0
+    assert _percentile([1.0, 2.0], 50) == 1.0
+
+
+def test_summarize_excludes_errors_from_latencies():
+    samples = [("ask", True, 0.1), ("ask", True, 0.2), ("ask", False, 9.0), ("health", True, 0.001)]
+    out = summarize(samples, elapsed=2.0)
+    assert list(out) == ["ask", "health"]
+    ask = out["ask"]
+    assert ask["requests"] == 3
+    assert ask["errors"] == 1
+    assert ask["throughput_rps"] == 1.0  # successful requests only
+    assert ask["p50_ms"] == 100.0
+    assert ask["p99_ms"] == 200.0
+
+
+def test_summarize_all_errors():
+    out = summarize([("ask", False, 1.0)], elapsed=1.0)
+    assert out["ask"]["errors"] == 1
+    assert out["ask"]["p95_ms"] == 0.0
+    assert out["ask"]["throughput_rps"] == 0.0
+
+
+def endpoint(p50=100.0, p95=200.0, p99=300.0, rps=10.0, errors=0):
+    return {"p50_ms": p50, "p95_ms": p95, "p99_ms": p99, "throughput_rps": rps, "errors": errors}
+
+
+def report(**endpoints):
+    return {"endpoints": endpoints}
+
+
+def test_compare_identical_run_passes():
+    assert compare(report(ask=endpoint()), report(ask=endpoint()), 0.2) == []
+
+
+def test_compare_exactly_at_threshold_passes():
+    current = report(ask=endpoint(p50=120.0, p95=240.0, p99=360.0, rps=8.0))
+    assert compare(current, report(ask=endpoint()), 0.2) == []
+
+
+def test_compare_beyond_threshold_fails():
+    current = report(ask=endpoint(p95=240.1, rps=7.9))
+    failures = compare(current, report(ask=endpoint()), 0.2)
+    assert len(failures) == 2
+    assert failures[0].startswith("ask p95_ms")
+    assert failures[1].startswith("ask throughput_rps")
+
+
+def test_compare_more_errors_fails():
+    failures = compare(report(ask=endpoint(errors=2)), report(ask=endpoint(errors=1)), 0.2)
+    assert failures == ["ask errors: 2 > 1"]
+
+
+def test_compare_missing_endpoint_fails():
+    failures = compare(report(ask=endpoint()), report(ask=endpoint(), health=endpoint()), 0.2)
+    assert failures == ["health: missing from this run"]
+
+
+def test_compare_ignores_endpoint_new_in_this_run_and_zero_baseline():
+    baseline = report(ask=endpoint(p50=0.0, p95=0.0, p99=0.0, rps=0.0))
+    assert compare(report(ask=endpoint(), health=endpoint()), baseline, 0.2) == []
+
+
+def test_fake_embedding_uses_embed_dim():
+    vec = fake_embedding("hàm băm")
+    assert len(vec) == settings.embed_dim
+    assert vec == fake_embedding("hàm băm")
+    assert len(fake_embedding("x", dim=8)) == 8
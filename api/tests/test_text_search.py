@@ -0,0 +1,120 @@
+import pytest
+
+from app.text_search import normalize_text, parse_query, to_tsquery, tokenize
+
+
+def tsq(query: str) -> str:
+    return to_tsquery(parse_query(query))
+
+
+def test_normalize_strips_diacritics_and_d_stroke():
+    assert normalize_text("Hàm Băm") == "ham bam"
+    assert normalize_text("ĐẠI HỌC đa") == "dai hoc da"
+
+
+def test_unaccented_and_accented_queries_match():
+    assert tsq("hàm băm") == tsq("ham bam") == "((ham <-> bam) | ham | bam)"
+
+
+def test_single_term():
+    assert tsq("RSA") == "rsa"
+
+
+def test_free_text_matches_adjacent_bigrams_or_single_terms():
+    assert tsq("bảo mật dữ liệu") == (
+        "((bao <-> mat) | (mat <-> du) | (du <-> lieu) | bao | mat | du | lieu)"
+    )
+
+
+def test_keyword_is_not_hidden_behind_function_word_bigram():
+    # a chunk with "là gì" but no "rsa" must not be the only kind of match
+    out = tsq("RSA là gì")
+    assert out == "((rsa <-> la) | (la <-> gi) | rsa | la | gi)"
+    assert "| rsa |" in out
+
+
+def test_quoted_phrase_is_required():
+    parsed = parse_query('"chữ ký số" xác thực')
+    assert parsed.phrases == [["chu", "ky", "so"]]
+    assert parsed.terms == ["xac", "thuc"]
+    assert to_tsquery(parsed) == "(chu <-> ky <-> so) & ((xac <-> thuc) | xac | thuc)"
+
+
+def test_single_word_phrase():
+    assert tsq('"RSA"') == "rsa"
+
+
+def test_trailing_star_is_prefix():
+    parsed = parse_query("chữ ký*")
+    assert parsed.terms == ["chu"]
+    assert parsed.prefix == "ky"
+    assert to_tsquery(parsed) == "((chu <-> ky:*) | chu | ky:*)"
+    assert tsq("mã*") == "ma:*"
+
+
+def test_star_only_applies_to_last_token():
+    parsed = parse_query("ha* bam")
+    assert parsed.prefix == ""
+    assert parsed.terms == ["ha", "bam"]
+
+
+def test_user_typed_tsquery_prefix_syntax():
+    parsed = parse_query("x:*")
+    assert parsed.prefix == "x"
+    assert tsq("x:*") == "x:*"
+
+
+def test_lone_star_is_ignored():
+    assert parse_query("*").is_empty()
+    assert tsq("*") == ""
+    assert tsq("hàm *") == "ham"
+
+
+@pytest.mark.parametrize("query", [
+    "a & b | !c",
+    "a:B <-> (c)",
+    "a' || 'b",
+    "a\\b;--",
+])
+def test_operators_and_punctuation_are_stripped(query):
+    out = tsq(query)
+    tokens = out.replace("(", " ").replace(")", " ").replace("<->", " ").replace("|", " ").split()
+    assert all(t.isalnum() for t in tokens), out
+
+
+def test_operators_inside_phrase_are_stripped():
+    assert tsq('"a & b" | !c') == "(a <-> b) & c"
+
+
+@pytest.mark.parametrize("query", ["", "   ", '""', '"   "', '"', "?!.,", None])
+def test_empty_input(query):
+    parsed = parse_query(query)
+    assert parsed.is_empty()
+    assert parsed.normalized == ""
+    assert to_tsquery(parsed) == ""
+
+
+def test_normalized_for_trigram_fallback():
+    assert parse_query('bảo "hàm băm" ký*').normalized == "ham bam bao ky"
+
+
+def test_tokenize_splits_on_punctuation():
+    assert tokenize("Hàm băm (SHA-256)") == ["ham", "bam", "sha", "-256"]
+
+
+@pytest.mark.parametrize("text, tokens", [
+    # same tokens as ts_debug('vn_unaccent', ...): asciiword + signed int
+    ("SHA-256", ["sha", "-256"]),
+    ("AES-128", ["aes", "-128"]),
+    ("SHA-1", ["sha", "-1"]),
+    ("sha256", ["sha256"]),
+    ("e-mail", ["e", "mail"]),
+    ("AES-128bit", ["aes", "128bit"]),
+])
+def test_tokenize_matches_postgres_parser_for_hyphenated_numbers(text, tokens):
+    assert tokenize(text) == tokens
+
+
+def test_hyphenated_number_query():
+    assert tsq("SHA-256") == "((sha <-> -256) | sha | -256)"
+    assert tsq('"AES-128" mode') == "(aes <-> -128) & mode"
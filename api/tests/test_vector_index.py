@@ -0,0 +1,171 @@
+import json
+from contextlib import contextmanager
+
+import numpy as np
+import pytest
+
+import app.vector_index as vi
+
+DIM = 4
+
+
+def row(chunk_id: int, text: str = "", document_id: int = 1):
+    rng = np.random.default_rng(chunk_id)
+    embedding = json.dumps(rng.standard_normal(DIM).round(6).tolist())
+    return (chunk_id, document_id, chunk_id, text or f"chunk {chunk_id}", embedding)
+
+
+class FakeChunks:
+    """Stands in for the chunks table behind get_conn()"""
+
+    def __init__(self, rows):
+        self.rows = list(rows)
+        self.fetched_after = []
+
+    @contextmanager
+    def conn(self):
+        yield self
+
+    def execute(self, sql, params=None):
+        self._sql, self._params = sql, params
+        return self
+
+    def fetchone(self):
+        ids = [r[0] for r in self.rows]
+        return len(ids), max(ids, default=0)
+
+    def fetchall(self):
+        after_id = self._params[0]
+        self.fetched_after.append(after_id)
+        return [r for r in self.rows if r[0] > after_id]
+
+
+@pytest.fixture
+def chunks(monkeypatch):
+    table = FakeChunks([row(1, "hàm băm SHA-256"), row(2, "chữ ký số RSA"), row(3, "mã hóa đối xứng")])
+    monkeypatch.setattr(vi, "get_conn", table.conn)
+    return table
+
+
+def make_index(tmp_path, **kwargs):
+    kwargs.setdefault("dim", DIM)
+    return vi.LocalVectorIndex(str(tmp_path / "chunks"), refresh_secs=3600, **kwargs)
+
+
+def versions(tmp_path):
+    return sorted(p.name for p in tmp_path.glob("chunks.*.npy"))
+
+
+def test_refresh_publishes_memory_mapped_snapshot(tmp_path, chunks):
+    index = make_index(tmp_path)
+    index.refresh(force=True)
+    assert index._state[1].tolist() == [1, 2, 3]
+    assert isinstance(index._state[0], np.memmap)
+    assert (tmp_path / "chunks.current").read_text() == index._version
+    assert versions(tmp_path) == [f"chunks.{index._version}.npy"]
+
+
+def test_new_chunks_are_appended_incrementally(tmp_path, chunks):
+    index = make_index(tmp_path)
+    index.refresh(force=True)
+    chunks.rows.append(row(4))
+    index.refresh(force=True)
+    assert index._state[1].tolist() == [1, 2, 3, 4]
+    assert chunks.fetched_after == [0, 3]
+
+
+def test_deleted_chunk_triggers_rebuild(tmp_path, chunks):
+    index = make_index(tmp_path)
+    index.refresh(force=True)
+    del chunks.rows[1]
+    chunks.rows.append(row(4))
+    index.refresh(force=True)
+    assert index._state[1].tolist() == [1, 3, 4]
+    assert chunks.fetched_after[-1] == 0
+
+
+def test_old_versions_are_pruned(tmp_path, chunks):
+    index = make_index(tmp_path)
+    index.refresh(force=True)
+    first = index._version
+    chunks.rows.append(row(4))
+    index.refresh(force=True)
+    second = index._version
+    chunks.rows.append(row(5))
+    index.refresh(force=True)
+    assert first not in {second, index._version}
+    assert versions(tmp_path) == sorted(f"chunks.{v}.npy" for v in (second, index._version))
+
+
+def test_other_process_loads_published_snapshot_without_db(tmp_path, chunks, monkeypatch):
+    make_index(tmp_path).refresh(force=True)
+
+    @contextmanager
+    def unreachable():
+        raise OSError("connection refused")
+        yield
+
+    monkeypatch.setattr(vi, "get_conn", unreachable)
+    reader = make_index(tmp_path)
+    assert reader._state[1].tolist() == [1, 2, 3]
+    assert isinstance(reader._state[0], np.memmap)
+    reader.refresh(force=True)  # DB down: keeps serving the snapshot
+    assert reader._state[1].tolist() == [1, 2, 3]
+
+
+def test_non_writer_switches_to_published_snapshot(tmp_path, chunks, monkeypatch):
+    reader = make_index(tmp_path)
+
+    @contextmanager
+    def not_writer():
+        yield False
+
+    monkeypatch.setattr(reader, "_writer_lock", not_writer)
+    reader.refresh(force=True)
+    assert not isinstance(reader._state[0], np.memmap)  # synced in memory, nothing published
+
+    writer = make_index(tmp_path)
+    writer.refresh(force=True)
+    reader.refresh(force=True)
+    assert reader._version == writer._version
+    assert isinstance(reader._state[0], np.memmap)
+
+
+def test_search_ranks_by_cosine(tmp_path, chunks):
+    index = make_index(tmp_path)
+    index.refresh(force=True)
+    query = json.loads(row(2)[4])
+    hits = index.search(query, limit=2)
+    assert [h["id"] for h in hits][0] == 2
+    assert hits[0]["score"] == pytest.approx(1.0, abs=1e-5)
+
+
+@pytest.mark.parametrize("dtype, dim", [("float16", DIM), ("float32", DIM + 1)])
+def test_snapshot_with_other_dtype_or_dim_is_rejected(tmp_path, chunks, dtype, dim):
+    make_index(tmp_path).refresh(force=True)
+    other = make_index(tmp_path, dtype=dtype, dim=dim)
+    assert other._version is None
+    assert other._state[0] is None
+
+
+def test_float16_index(tmp_path, chunks):
+    index = make_index(tmp_path, dtype="float16")
+    index.refresh(force=True)
+    assert index._state[0].dtype == np.float16
+
+
+@pytest.mark.parametrize("dtype", ["float64", "int8", "bfloat16"])
+def test_unsupported_dtype_raises(tmp_path, dtype):
+    with pytest.raises((ValueError, TypeError)):
+        make_index(tmp_path, dtype=dtype)
+
+
+def test_keyword_search_over_snapshot_texts(tmp_path, chunks):
+    index = make_index(tmp_path)
+    index.refresh(force=True)
+    hits = index.keyword_search("chu ky")
+    assert [h["id"] for h in hits] == [2]
+    assert hits[0]["score"] == 1.0
+    assert index.keyword_search('"ham bam" rsa')[0]["id"] == 1
+    assert index.keyword_search("ma*")[0]["id"] == 3
+    assert index.keyword_search("blockchain") == []
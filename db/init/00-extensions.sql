@@ -1,2 +1,3 @@
 CREATE EXTENSION IF NOT EXISTS vector; -- pgvector
-CREATE EXTENSION IF NOT EXISTS pg_trgm; -- for fuzzy keyword search (optional)
\ No newline at end of file
+CREATE EXTENSION IF NOT EXISTS pg_trgm; -- for fuzzy keyword search (optional)
+CREATE EXTENSION IF NOT EXISTS unaccent; -- diacritic-insensitive keyword search (see 02-keyword-search.sql)
@@ -0,0 +1,51 @@
+-- Vietnamese-aware keyword search: unaccented, normalized tsvector + trigram column
+-- Runs automatically on a fresh volume; for an existing DB apply once with:
+--   docker compose exec -T db psql -U rag -d rag < db/init/02-keyword-search.sql
+
+CREATE EXTENSION IF NOT EXISTS unaccent;
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+
+-- unaccent() is only STABLE; this wrapper pins the dictionary so it can be used
+-- in generated columns and expression indexes ("Hàm Băm" -> "ham bam", "Đ" -> "d")
+CREATE OR REPLACE FUNCTION vn_unaccent(text) RETURNS text
+LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT AS
+$$ SELECT public.unaccent('public.unaccent'::regdictionary, lower($1)) $$;
+
+
+-- 'simple' parser + unaccent dictionary: each Vietnamese syllable becomes one
+-- lowercase, diacritic-free lexeme; no stemming/stopwords (mixed vi-en text)
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = 'vn_unaccent') THEN
+        CREATE TEXT SEARCH CONFIGURATION vn_unaccent (COPY = simple);
+        ALTER TEXT SEARCH CONFIGURATION vn_unaccent
+            ALTER MAPPING FOR asciiword, asciihword, hword_asciipart, word, hword, hword_part
+            WITH unaccent, simple;
+    END IF;
+END
+$$;
+
+
+-- Precomputed at write time, so queries never normalize chunk text
+ALTER TABLE chunks ADD COLUMN IF NOT EXISTS content_norm TEXT
+GENERATED ALWAYS AS (vn_unaccent(coalesce(content, ''))) STORED;
+
+ALTER TABLE chunks ADD COLUMN IF NOT EXISTS content_norm_tsv tsvector
+GENERATED ALWAYS AS (to_tsvector('vn_unaccent'::regconfig, coalesce(content, ''))) STORED;
+
+
+-- Full-text (phrase / prefix queries via to_tsquery('vn_unaccent', ...))
+CREATE INDEX IF NOT EXISTS idx_chunks_norm_tsv_gin
+ON chunks USING GIN (content_norm_tsv);
+
+-- Trigram fallback on unaccented text (word_similarity / <% operator)
+CREATE INDEX IF NOT EXISTS idx_chunks_norm_trgm
+ON chunks USING GIN (content_norm gin_trgm_ops);
+
+
+-- Superseded by the columns above; nothing queries them and every insert would
+-- still maintain two extra GIN indexes (no-op on databases created after this change)
+DROP INDEX IF EXISTS idx_chunks_tsv_gin;
+DROP INDEX IF EXISTS idx_chunks_trgm;
+ALTER TABLE chunks DROP COLUMN IF EXISTS content_tsv;